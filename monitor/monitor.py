@@ -1,24 +1,40 @@
 import argparse
 import configparser
+import functools
+import getpass
 import logging
 import os
+import smtplib
+import socket
 import stat
 import subprocess
 import sys
+import threading
 import time
-from datetime import datetime
+from collections.abc import Mapping
+from datetime import date, datetime, timedelta
+from email.message import EmailMessage
 import grp
 import pwd
 
 import obsws_python as obs
-from watchdog.events import FileSystemEventHandler
+from watchdog.events import EVENT_TYPE_CLOSED, FileSystemEventHandler
 from watchdog.observers import Observer
 
+try:
+    import docker
+except ImportError:  # Optional (`pip install docker`); health checks fall back to the CLI.
+    docker = None
+
 
 DEFAULT_CONFIG_PATH = os.path.join(os.path.dirname(__file__), "monitor.ini")
 
 
 _CFG: dict = {}
+_DOCKER_CLIENT = None
+_SMTP_CLIENT: smtplib.SMTP | None = None
+_SMTP_LOCK = threading.Lock()
+_DATE_PATH_CACHE: tuple[date | None, str | None, str | None] = (None, None, None)
 
 
 def _parse_csv(value: str) -> list[str]:
@@ -39,19 +55,13 @@ def _parse_bool(value: object | None, default: bool) -> bool:
 def _parse_octal_mode(value: object | None, default: int) -> int:
     if value is None:
         return default
-    raw = str(value).strip().lower()
+    raw = str(value).strip()
     if not raw:
         return default
+    # Base 8 accepts 644, 0644 and 0o644 alike.
     try:
-        if raw.startswith("0o"):
-            return int(raw, 8)
-        if raw.startswith("0"):
-            return int(raw, 8)
-        # If user enters 644/755, treat as octal digits.
-        if all(ch in "01234567" for ch in raw):
-            return int(raw, 8)
         return int(raw, 8)
-    except Exception:
+    except ValueError:
         return default
 
 
@@ -83,16 +93,33 @@ def _resolve_uid_gid(user_group: str) -> tuple[int | None, int | None]:
     return uid, gid
 
 
-def load_config(config_path: str) -> dict:
+@functools.lru_cache(maxsize=8)
+def _read_ini(config_path: str, mtime_ns: int) -> dict[str, dict[str, str]]:
+    """Parse an INI file into plain section dicts, cached by (path, mtime)."""
     config = configparser.ConfigParser()
     read_ok = config.read(config_path)
     if not read_ok:
         raise FileNotFoundError(f"Config file not found/readable: {config_path}")
+    return {section: dict(config[section]) for section in config.sections()}
+
 
-    monitor = config["monitor"] if config.has_section("monitor") else {}
-    obs_cfg = config["obs"] if config.has_section("obs") else {}
-    intervals = config["intervals"] if config.has_section("intervals") else {}
-    permissions = config["permissions"] if config.has_section("permissions") else {}
+def load_config(config_path: str) -> dict:
+    try:
+        mtime_ns = os.stat(config_path).st_mtime_ns
+    except OSError:
+        raise FileNotFoundError(f"Config file not found/readable: {config_path}")
+    return _load_config_from_sections(_read_ini(config_path, mtime_ns))
+
+
+def _load_config_from_sections(sections: Mapping[str, Mapping[str, str]]) -> dict:
+    """Build the flat cfg dict (with defaults) from parsed INI sections.
+
+    Accepts the cached section dicts or a ConfigParser; neither is modified.
+    """
+    monitor = sections["monitor"] if "monitor" in sections else {}
+    obs_cfg = sections["obs"] if "obs" in sections else {}
+    intervals = sections["intervals"] if "intervals" in sections else {}
+    permissions = sections["permissions"] if "permissions" in sections else {}
 
     required_containers = _parse_csv(
         monitor.get("required_containers", "obs_compositor, mediamtx")
@@ -110,6 +137,8 @@ def load_config(config_path: str) -> dict:
         "required_containers": required_containers,
         "retention_days": int(monitor.get("retention_days", "7")),
         "cooldown_seconds": int(monitor.get("cooldown_seconds", "10")),
+        "debounce_seconds": int(monitor.get("debounce_seconds", "2")),
+        "debounce_max_seconds": int(monitor.get("debounce_max_seconds", "10")),
         "log_file": monitor.get("log_file", "/var/log/reolink_monitor.log"),
         "send_to": monitor.get("send_to", "root"),
 
@@ -132,6 +161,13 @@ def load_config(config_path: str) -> dict:
         "permissions_file_mode": _parse_octal_mode(permissions.get("file_mask", ""), 0o644),
         "permissions_dir_mode": _parse_octal_mode(permissions.get("directory_mask", ""), 0o755),
     }
+
+    # Resolve user_group once (NSS lookups can be slow); apply_permissions re-tries
+    # and logs on each event if this fails.
+    try:
+        cfg["_uid"], cfg["_gid"] = _resolve_uid_gid(cfg["permissions_user_group"])
+    except Exception:
+        pass
     return cfg
 
 
@@ -143,44 +179,157 @@ def setup_logging(log_file: str) -> None:
     )
 
 
+@functools.lru_cache(maxsize=1)
+def _smtp_sender() -> str:
+    """Envelope/From address, resolved once (no DNS: gethostname, not getfqdn)."""
+    try:
+        user = getpass.getuser()
+    except Exception:
+        # e.g. a container uid without a passwd entry
+        user = str(os.getuid())
+    return f"{user}@{socket.gethostname()}"
+
+
+def _send_via_smtp(send_to: str, subject: str, message: str) -> None:
+    """Sends through the local MTA, reusing one SMTP session across alerts."""
+    global _SMTP_CLIENT
+    msg = EmailMessage()
+    msg["Subject"] = subject
+    msg["From"] = _smtp_sender()
+    msg["To"] = send_to
+    msg.set_content(message)
+
+    # Alerts come from both the main loop and the observer/debounce threads.
+    with _SMTP_LOCK:
+        if _SMTP_CLIENT is not None:
+            try:
+                _SMTP_CLIENT.send_message(msg)
+                return
+            except (OSError, smtplib.SMTPException):
+                # Idle sessions get dropped by the MTA; reconnect once below.
+                try:
+                    _SMTP_CLIENT.close()
+                except Exception:
+                    pass
+                _SMTP_CLIENT = None
+
+        client = smtplib.SMTP("localhost", 25, timeout=10)
+        try:
+            client.send_message(msg)
+        except Exception:
+            client.close()
+            raise
+        _SMTP_CLIENT = client
+
+
 def send_alert_email(send_to: str, subject: str, message: str) -> None:
-    """Sends a system mail alert."""
+    """Sends a system mail alert (local SMTP, falling back to the `mail` command)."""
     try:
-        subprocess.run(
-            ["mail", "-s", subject, send_to],
-            input=message,
-            text=True,
-            check=True,
-        )
+        try:
+            _send_via_smtp(send_to, subject, message)
+        except Exception as e:
+            logging.warning(f"SMTP send failed, falling back to mail command: {e}")
+            subprocess.run(
+                ["mail", "-s", subject, send_to],
+                input=message,
+                text=True,
+                check=True,
+            )
         logging.info(f"Health Alert Sent: {subject}")
     except Exception as e:
         logging.error(f"Failed to send email: {e}")
 
 
+def seconds_until_midnight() -> float:
+    """Returns seconds until the next local midnight (day-folder rollover)."""
+    now = datetime.now()
+    midnight = datetime.combine(now.date() + timedelta(days=1), datetime.min.time())
+    return (midnight - now).total_seconds()
+
+
 def get_current_date_path(base_path: str) -> str:
-    """Returns today's path based on YYYY/MM/DD structure."""
-    return os.path.join(base_path, datetime.now().strftime("%Y/%m/%d"))
+    """Returns today's path based on YYYY/MM/DD structure (formatted once per day)."""
+    global _DATE_PATH_CACHE
+    today = date.today()
+    cached_day, cached_base, cached_path = _DATE_PATH_CACHE
+    if cached_day != today or cached_base != base_path:
+        cached_path = os.path.join(base_path, today.strftime("%Y/%m/%d"))
+        _DATE_PATH_CACHE = (today, base_path, cached_path)
+    return cached_path
+
+
+def _running_container_names_sdk() -> set[str]:
+    """Returns running container names via the Docker SDK (keeps one socket client)."""
+    global _DOCKER_CLIENT
+    if _DOCKER_CLIENT is None:
+        _DOCKER_CLIENT = docker.from_env()
+    try:
+        containers = _DOCKER_CLIENT.containers.list(filters={"status": "running"})
+    except Exception:
+        # Release the pooled connection before dropping the client
+        client, _DOCKER_CLIENT = _DOCKER_CLIENT, None
+        try:
+            client.close()
+        except Exception:
+            pass
+        raise
+    return {c.name for c in containers}
+
+
+def _running_container_names() -> set[str]:
+    """Returns the names of all running containers (Docker SDK, else one `docker ps`)."""
+    if docker is not None:
+        try:
+            return _running_container_names_sdk()
+        except Exception as e:
+            logging.warning(f"Docker SDK health check failed, using docker CLI: {e}")
+
+    result = subprocess.run(
+        ["docker", "ps", "--filter", "status=running", "--format", "{{.Names}}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return set(result.stdout.split())
+
+
+def _check_container_running(container: str) -> None:
+    """Raises if a single container is not running (per-container fallback)."""
+    result = subprocess.run(
+        ["docker", "inspect", "-f", "{{.State.Running}}", container],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    if result.stdout.strip() != "true":
+        raise Exception(f"Container {container} is not running.")
+
+
+def _report_container_down(container: str, send_to: str, error: Exception) -> None:
+    logging.error(f"DOCKER HEALTH CHECK FAILED: {error}")
+    send_alert_email(
+        send_to,
+        f"CRITICAL: Docker Container {container} Down",
+        f"Health check failed for {container} at {datetime.now()}.\nError: {error}",
+    )
 
 
 def check_docker_health(required_containers: list[str], send_to: str) -> None:
     """Verifies that the required Docker containers are actually running."""
+    try:
+        running = _running_container_names()
+    except Exception as e:
+        logging.warning(f"docker ps failed, falling back to per-container inspect: {e}")
+        running = None
+
     for container in required_containers:
         try:
-            result = subprocess.run(
-                ["docker", "inspect", "-f", "{{.State.Running}}", container],
-                capture_output=True,
-                text=True,
-                check=True,
-            )
-            if result.stdout.strip() != "true":
+            if running is None:
+                _check_container_running(container)
+            elif container not in running:
                 raise Exception(f"Container {container} is not running.")
         except Exception as e:
-            logging.error(f"DOCKER HEALTH CHECK FAILED: {e}")
-            send_alert_email(
-                send_to,
-                f"CRITICAL: Docker Container {container} Down",
-                f"Health check failed for {container} at {datetime.now()}.\nError: {e}",
-            )
+            _report_container_down(container, send_to, e)
 
 
 def ensure_directory_permissions(path: str, mode: int = 0o755) -> None:
@@ -202,11 +351,14 @@ def apply_permissions(path: str, cfg: dict, is_dir: bool) -> None:
     if not cfg.get("permissions_enabled", True):
         return
 
-    try:
-        uid, gid = _resolve_uid_gid(cfg.get("permissions_user_group", ""))
-    except Exception as e:
-        logging.error(f"Failed to resolve user_group for permissions fixups: {e}")
-        uid, gid = None, None
+    if "_uid" in cfg:
+        uid, gid = cfg["_uid"], cfg.get("_gid")
+    else:
+        try:
+            uid, gid = _resolve_uid_gid(cfg.get("permissions_user_group", ""))
+        except Exception as e:
+            logging.error(f"Failed to resolve user_group for permissions fixups: {e}")
+            uid, gid = None, None
 
     try:
         if uid is not None or gid is not None:
@@ -217,10 +369,10 @@ def apply_permissions(path: str, cfg: dict, is_dir: bool) -> None:
         logging.error(f"Failed to chown {path}: {e}")
 
     try:
+        # Fresh uploads almost always need fixing, so chmod unconditionally
+        # rather than paying for a stat first.
         desired_mode = cfg["permissions_dir_mode"] if is_dir else cfg["permissions_file_mode"]
-        current = stat.S_IMODE(os.stat(path).st_mode)
-        if current != desired_mode:
-            os.chmod(path, desired_mode)
+        os.chmod(path, desired_mode)
     except PermissionError as e:
         logging.error(f"Permission denied chmod {path}: {e}")
     except Exception as e:
@@ -279,6 +431,8 @@ def validate_config(cfg: dict) -> tuple[list[str], list[str]]:
 
     _nonneg_int("retention_days")
     _nonneg_int("cooldown_seconds")
+    _nonneg_int("debounce_seconds")
+    _nonneg_int("debounce_max_seconds")
     _positive_int("health_check_seconds")
     _positive_int("main_loop_sleep_seconds")
     _positive_int("directory_poll_seconds")
@@ -306,24 +460,127 @@ def validate_config(cfg: dict) -> tuple[list[str], list[str]]:
 
 class ReolinkHandler(FileSystemEventHandler):
     def __init__(self, cfg: dict):
-        self.last_trigger_time = 0
         self.cfg = cfg
+        self._cooldown = cfg["cooldown_seconds"]
+        self._debounce = cfg["debounce_seconds"]
+        self._debounce_max = cfg["debounce_max_seconds"]
+        self.cl = None
+        self.ev = None
+        self._playback_done = threading.Event()
+
+        # Debounce state: bursts of clips collapse into one trigger for the newest.
+        self._lock = threading.Lock()
+        self._busy = False
+        self._pending: str | None = None
+        self._timer: threading.Timer | None = None
+        self._burst_start = 0.0
+        self._last_trigger = float("-inf")
+
+    def dispatch(self, event):
+        """Drops everything but closed .mp4 files before watchdog's on_* demux."""
+        if event.event_type != EVENT_TYPE_CLOSED or event.is_directory:
+            return
+        src_path = event.src_path
+        if not src_path.endswith(".mp4" if isinstance(src_path, str) else b".mp4"):
+            return
+        super().dispatch(event)
 
     def on_closed(self, event):
         """Triggers when a file is fully written/closed by the FTP server."""
-        src_path = os.fsdecode(event.src_path)
-        if not event.is_directory and src_path.endswith(".mp4"):
-            current_time = time.time()
-            if current_time - self.last_trigger_time < self.cfg["cooldown_seconds"]:
+        src_path = event.src_path
+        if not isinstance(src_path, str):
+            src_path = os.fsdecode(src_path)
+
+        # Optional permission fixups (chmod/chown) for vsftpd quirks.
+        apply_permissions(src_path, self.cfg, is_dir=False)
+
+        # (Re)start the debounce timer; only the newest clip is played. A burst
+        # never waits longer than debounce_max_seconds from its first clip, and
+        # cooldown_seconds still spaces consecutive triggers apart (deferred,
+        # not dropped).
+        now = time.monotonic()
+        with self._lock:
+            if self._pending is None:
+                self._burst_start = now
+            self._pending = src_path
+            deadline = min(now + self._debounce, self._burst_start + self._debounce_max)
+            deadline = max(deadline, self._last_trigger + self._cooldown)
+            self._arm_timer(deadline - now)
+
+    def _arm_timer(self, delay: float) -> None:
+        """(Re)schedules _flush; caller holds self._lock."""
+        if self._timer is not None:
+            self._timer.cancel()
+        self._timer = threading.Timer(max(0.0, delay), self._flush)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def _flush(self):
+        """Plays the newest clip once the burst has gone quiet (or hit its cap)."""
+        with self._lock:
+            if self._timer is threading.current_thread():
+                self._timer = None
+            # A trigger is already playing: leave the clip pending, it re-arms us
+            if self._busy or self._pending is None:
                 return
+            src_path, self._pending = self._pending, None
+            self._busy = True
+            self._last_trigger = time.monotonic()
 
+        try:
             logging.info(f"New Motion Alert: {src_path}")
-            self.last_trigger_time = current_time
-
-            # Optional permission fixups (chmod/chown) for vsftpd quirks.
-            apply_permissions(src_path, self.cfg, is_dir=False)
-
             self.trigger_obs(src_path)
+        finally:
+            with self._lock:
+                self._busy = False
+                # Clips that landed during playback: newest plays after the cooldown
+                if self._pending is not None and self._timer is None:
+                    self._arm_timer(self._last_trigger + self._cooldown - time.monotonic())
+
+    def _get_client(self):
+        """Returns the cached OBS client, reconnecting if it has gone stale."""
+        if self.cl is not None:
+            try:
+                self.cl.get_version()
+                return self.cl
+            except Exception:
+                self._drop_client("cl")
+
+        self.cl = obs.ReqClient(
+            host=self.cfg["obs_host"],
+            port=self.cfg["obs_port"],
+            password=self.cfg.get("obs_password", ""),
+        )
+        return self.cl
+
+    def _get_event_client(self):
+        """Returns the cached OBS event client, reconnecting if its listener has died."""
+        if self.ev is not None and self.ev.worker.is_alive():
+            return self.ev
+        self._drop_client("ev")
+
+        self.ev = obs.EventClient(
+            host=self.cfg["obs_host"],
+            port=self.cfg["obs_port"],
+            password=self.cfg.get("obs_password", ""),
+        )
+        self.ev.callback.register(self.on_media_input_playback_ended)
+        return self.ev
+
+    def _drop_client(self, attr: str) -> None:
+        """Forgets a cached OBS client so the next trigger reconnects."""
+        client = getattr(self, attr)
+        setattr(self, attr, None)
+        if client is not None:
+            try:
+                client.disconnect()
+            except Exception:
+                pass
+
+    def on_media_input_playback_ended(self, data):
+        """OBS event callback: wakes trigger_obs when the alert clip finishes."""
+        if getattr(data, "input_name", None) == self.cfg["obs_media_input"]:
+            self._playback_done.set()
 
     def trigger_obs(self, file_path):
         """Commands OBS via WebSocket to switch scenes and play the video."""
@@ -337,35 +594,31 @@ class ReolinkHandler(FileSystemEventHandler):
             target_path = container_error_path
 
         try:
-            cl = obs.ReqClient(
-                host=self.cfg["obs_host"],
-                port=self.cfg["obs_port"],
-                password=self.cfg.get("obs_password", ""),
-            )
+            cl = self._get_client()
+            self._get_event_client()
 
             media_input = self.cfg["obs_media_input"]
             scene_alert = self.cfg["obs_scene_alert"]
             scene_standby = self.cfg["obs_scene_standby"]
 
-            # Clear and reset the Media Input
-            cl.set_input_settings(media_input, {"local_file": ""}, overlay=True)
-            time.sleep(0.1)
+            # Fresh wake-up for this clip; set by on_media_input_playback_ended
+            self._playback_done = threading.Event()
+
+            # Point the Media Input at the clip. A changed local_file reloads the
+            # source on its own; the error video is already loaded (it's the re-arm
+            # file), so restart it explicitly instead.
             cl.set_input_settings(media_input, {"local_file": target_path}, overlay=True)
+            if target_path == container_error_path:
+                cl.trigger_media_input_action(
+                    media_input, "OBS_WEBSOCKET_MEDIA_INPUT_ACTION_RESTART"
+                )
 
             # Switch to the Alert Scene
             cl.set_current_program_scene(scene_alert)
 
             # Wait for video to end or timeout after 60s
-            time.sleep(2)
-            start_timeout = time.time()
-            while True:
-                status = cl.get_media_input_status(media_input)
-                media_state = getattr(status, "media_state", None)
-                if media_state in ["OBS_MEDIA_STATE_ENDED", "OBS_MEDIA_STATE_STOPPED"]:
-                    break
-                if time.time() - start_timeout > 60:
-                    break
-                time.sleep(0.5)
+            if not self._playback_done.wait(timeout=60):
+                logging.warning("OBS: Timed out waiting for alert playback to end.")
 
             # Return to Standby
             cl.set_current_program_scene(scene_standby)
@@ -379,35 +632,141 @@ class ReolinkHandler(FileSystemEventHandler):
             logging.info("OBS: Reset and re-armed.")
 
         except Exception as e:
+            self._drop_client("cl")
+            self._drop_client("ev")
             logging.error(f"OBS Connection Error: {e}")
             send_alert_email(self.cfg["send_to"], "CRITICAL: OBS Down", f"Connection failed: {e}")
 
+class DirectoryCreatedHandler(FileSystemEventHandler):
+    """Wakes a waiter once `target` exists (any directory creation re-checks it)."""
+
+    def __init__(self, target: str):
+        self.target = target
+        self.created = threading.Event()
+
+    def on_created(self, event):
+        if event.is_directory and os.path.isdir(self.target):
+            self.created.set()
+
+
+def wait_for_directory(
+    path: str, base_path: str, poll_seconds: int, observer: Observer | None = None
+) -> bool:
+    """Blocks until `path` exists. Returns False if the day rolls over first.
+
+    Watches the deepest existing ancestor under base_path via inotify so the wait
+    ends as soon as the camera creates the folder; `poll_seconds` remains as a
+    fallback re-check (e.g. network filesystems that don't deliver events).
+    A running `observer` is borrowed for the watch if given, else a temporary
+    one is started.
+    """
+    if os.path.exists(path):
+        return True
+
+    # Never climb above base_path (e.g. when base_path itself is missing).
+    base = os.path.normpath(base_path)
+    watch_root = os.path.dirname(os.path.normpath(path))
+    while watch_root != base and not os.path.isdir(watch_root):
+        watch_root = os.path.dirname(watch_root)
+
+    handler = DirectoryCreatedHandler(path)
+    owns_observer = observer is None
+    watch = None
+    if os.path.commonpath([watch_root, base]) == base and os.path.isdir(watch_root):
+        if owns_observer:
+            observer = Observer()
+        try:
+            watch = observer.schedule(handler, watch_root, recursive=True)
+            if owns_observer:
+                observer.start()
+        except Exception as e:
+            logging.error(f"Failed to watch {watch_root}, falling back to polling: {e}")
+            watch = None
+
+    try:
+        while not os.path.exists(path):
+            if handler.created.wait(timeout=poll_seconds):
+                handler.created.clear()
+            # Handle day rollover while waiting
+            if get_current_date_path(base_path) != path:
+                return False
+        return True
+    finally:
+        if watch is not None:
+            if owns_observer:
+                observer.stop()
+                observer.join()
+            else:
+                observer.unschedule(watch)
+
 # --- MAINTENANCE ---
 def cleanup_old_files():
     """Removes files older than RETENTION_DAYS to prevent disk bloat."""
     now = time.time()
     one_day_seconds = 86400
+    cutoff = now - _CFG["retention_days"] * one_day_seconds
+    dir_cutoff = now - one_day_seconds
     try:
-        for root, dirs, files in os.walk(_CFG["base_path"], topdown=False):
-            for file in files:
-                file_path = os.path.join(root, file)
-                if os.stat(file_path).st_mtime < now - (
-                    _CFG["retention_days"] * one_day_seconds
-                ):
-                    os.remove(file_path)
-                    logging.info(f"Purged old file: {file}")
-            
-            # Only remove empty directories if they haven't been touched in 24 hours
-            # This prevents the script from deleting today's folder before a file lands.
-            if not os.listdir(root) and root != _CFG["base_path"]:
-                folder_age = now - os.path.getmtime(root)
-                if folder_age > one_day_seconds:
-                    os.rmdir(root)
-                    logging.info(f"Purged empty directory: {root}")
+        _purge_directory(_CFG["base_path"], cutoff, dir_cutoff)
     except Exception as e:
         logging.error(f"Cleanup Error: {e}")
 
-def start_monitoring():
+def _purge_directory(path: str, cutoff: float, dir_cutoff: float) -> None:
+    """Bottom-up scandir walk: purge files older than `cutoff`, then stale empty subdirs."""
+    try:
+        with os.scandir(path) as it:
+            entries = list(it)
+    except OSError:
+        # Like os.walk: silently skip directories we can't list (incl. a missing base_path)
+        return
+
+    for entry in entries:
+        if entry.is_dir(follow_symlinks=False):
+            # One unreadable/vanished subtree must not abort the rest of the sweep
+            try:
+                _purge_directory(entry.path, cutoff, dir_cutoff)
+
+                # Only remove empty directories if they haven't been touched in 24 hours
+                # This prevents the script from deleting today's folder before a file lands.
+                with os.scandir(entry.path) as sub:
+                    empty = next(sub, None) is None
+                if empty and os.stat(entry.path).st_mtime < dir_cutoff:
+                    os.rmdir(entry.path)
+                    logging.info(f"Purged empty directory: {entry.path}")
+            except OSError as e:
+                logging.error(f"Cleanup Error: {e}")
+            continue
+
+        # Symlinked directories are left alone (os.walk never touched them);
+        # symlinked files are aged by their target, as before.
+        if entry.is_symlink() and entry.is_dir():
+            continue
+        if entry.stat().st_mtime < cutoff:
+            os.remove(entry.path)
+            logging.info(f"Purged old file: {entry.name}")
+
+def _ensure_observer(observer: Observer) -> Observer:
+    """Returns `observer`, or a freshly started one if its thread has died."""
+    if observer.is_alive():
+        return observer
+    # A handler exception kills watchdog's dispatch thread; watches added to it
+    # would never fire again.
+    logging.error("Observer thread died; starting a new one.")
+    try:
+        observer.stop()
+    except Exception:
+        pass
+    observer = Observer()
+    observer.start()
+    return observer
+
+
+def start_monitoring(observer: Observer, event_handler: ReolinkHandler) -> Observer:
+    """Watches today's folder until the day rolls over (or the observer dies).
+
+    Returns the observer to reuse next time; it is replaced if its thread died.
+    """
+    observer = _ensure_observer(observer)
     current_path = get_current_date_path(_CFG["base_path"])
     
     cleanup_old_files()
@@ -416,46 +775,52 @@ def start_monitoring():
     if not os.path.exists(current_path):
         logging.info(f"Watching for camera to create today's directory: {current_path}")
     
-    # Stay silent in the loop
-    while not os.path.exists(current_path):
-        time.sleep(_CFG["directory_poll_seconds"])
-        # Handle day rollover while waiting
-        if get_current_date_path(_CFG["base_path"]) != current_path:
-            return 
+    # Stay silent while waiting
+    if not wait_for_directory(
+        current_path, _CFG["base_path"], _CFG["directory_poll_seconds"], observer
+    ):
+        return observer
 
     if _CFG.get("permissions_enabled", True):
         ensure_directory_permissions(current_path, _CFG["permissions_dir_mode"])
         apply_permissions(current_path, _CFG, is_dir=True)
 
-    event_handler = ReolinkHandler(_CFG)
-    observer = Observer()
-    
     try:
-        observer.schedule(event_handler, current_path, recursive=False)
+        watch = observer.schedule(event_handler, current_path, recursive=False)
         # Log ONCE when the folder is finally found
         logging.info(f"Directory detected. Monitoring started on: {current_path}")
-        observer.start()
     except Exception as e:
         logging.error(f"Failed to start observer: {e}")
-        return
+        return observer
 
     try:
-        current_day = datetime.now().day
-        last_health_check = time.time()
+        current_day = datetime.now().date()
+        now = time.monotonic()
+        next_health = now + _CFG["health_check_seconds"]
+        next_midnight = now + seconds_until_midnight()
 
         while True:
-            time.sleep(_CFG["main_loop_sleep_seconds"])
+            # Sleep straight to the next deadline instead of polling
+            delay = min(next_health, next_midnight) - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            now = time.monotonic()
 
             # Health check every 5 minutes
-            if time.time() - last_health_check > _CFG["health_check_seconds"]:
+            if now >= next_health:
                 check_docker_health(_CFG["required_containers"], _CFG["send_to"])
-                last_health_check = time.time()
-
-            # Rotate monitor when the day changes
-            if datetime.now().day != current_day:
-                observer.stop()
-                observer.join()
-                return
+                next_health = time.monotonic() + _CFG["health_check_seconds"]
+
+            # Rotate the watch when the day changes; observer + handler persist
+            if datetime.now().date() != current_day:
+                observer.unschedule(watch)
+                return observer
+            # Dispatch thread died: return so the next pass replaces it
+            if not observer.is_alive():
+                return observer
+            if now >= next_midnight:
+                # Wall clock was adjusted since we aimed; re-aim at the real midnight
+                next_midnight = time.monotonic() + max(seconds_until_midnight(), 1)
     except KeyboardInterrupt:
         observer.stop()
         observer.join()
@@ -498,5 +863,9 @@ if __name__ == "__main__":
 
     setup_logging(_CFG["log_file"])
 
+    observer = Observer()
+    observer.start()
+    event_handler = ReolinkHandler(_CFG)
+
     while True:
-        start_monitoring()
\ No newline at end of file
+        observer = start_monitoring(observer, event_handler)
\ No newline at end of file
@@ -0,0 +1,8 @@
+import sys
+from pathlib import Path
+
+# Make `import monitor.monitor` resolve to the package when the tests are run
+# as `monitor.tests` from outside the repo root.
+REPO_ROOT = Path(__file__).resolve().parents[2]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
@@ -0,0 +1,40 @@
+import unittest
+from unittest import mock
+
+import monitor.monitor as MONITOR
+
+
+class TestSendAlertEmail(unittest.TestCase):
+    def setUp(self):
+        MONITOR._smtp_sender.cache_clear()
+        self.addCleanup(MONITOR._smtp_sender.cache_clear)
+
+    def test_sender_survives_missing_passwd_entry(self):
+        with mock.patch.object(MONITOR.getpass, "getuser", side_effect=KeyError("uid")):
+            sender = MONITOR._smtp_sender()
+        self.assertEqual(sender.split("@")[0], str(MONITOR.os.getuid()))
+
+    def test_falls_back_to_mail_command_when_smtp_fails(self):
+        with mock.patch.object(
+            MONITOR.smtplib, "SMTP", side_effect=ConnectionRefusedError()
+        ), mock.patch.object(MONITOR.subprocess, "run") as run:
+            MONITOR.send_alert_email("root", "subject", "body")
+
+        run.assert_called_once()
+        self.assertEqual(run.call_args.args[0], ["mail", "-s", "subject", "root"])
+
+    def test_failed_new_session_is_closed_and_not_cached(self):
+        client = mock.Mock()
+        client.send_message.side_effect = OSError("connection reset")
+        with mock.patch.object(MONITOR, "_SMTP_CLIENT", None), mock.patch.object(
+            MONITOR.smtplib, "SMTP", return_value=client
+        ), mock.patch.object(MONITOR.subprocess, "run") as run:
+            MONITOR.send_alert_email("root", "subject", "body")
+
+            client.close.assert_called_once()
+            self.assertIsNone(MONITOR._SMTP_CLIENT)
+        run.assert_called_once()
+
+
+if __name__ == "__main__":
+    unittest.main()
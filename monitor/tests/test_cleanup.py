@@ -0,0 +1,105 @@
+import os
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+import monitor.monitor as MONITOR
+
+
+def _touch(path: str, age_days: float) -> None:
+    mtime = time.time() - age_days * 86400
+    os.utime(path, (mtime, mtime))
+
+
+class TestCleanupOldFiles(unittest.TestCase):
+    def test_purges_old_files_and_stale_empty_dirs(self):
+        with tempfile.TemporaryDirectory() as base:
+            old_day = os.path.join(base, "2020", "01", "01")
+            new_day = os.path.join(base, "2020", "01", "02")
+            empty_today = os.path.join(base, "2020", "01", "03")
+            for d in (old_day, new_day, empty_today):
+                os.makedirs(d)
+
+            old_clip = os.path.join(old_day, "old.mp4")
+            new_clip = os.path.join(new_day, "new.mp4")
+            for clip, age in ((old_clip, 10), (new_clip, 1)):
+                with open(clip, "w") as f:
+                    f.write("x")
+                _touch(clip, age)
+            _touch(old_day, 10)
+
+            cfg = {"base_path": base, "retention_days": 7}
+            with mock.patch.object(MONITOR, "_CFG", cfg):
+                MONITOR.cleanup_old_files()
+
+                self.assertFalse(os.path.exists(old_clip))
+                self.assertTrue(os.path.exists(new_clip))
+                # Emptied this pass, so its mtime is fresh: kept until tomorrow's sweep.
+                self.assertTrue(os.path.isdir(old_day))
+                self.assertTrue(os.path.isdir(empty_today))
+                self.assertTrue(os.path.isdir(base))
+
+                _touch(old_day, 2)
+                MONITOR.cleanup_old_files()
+                self.assertFalse(os.path.exists(old_day))
+                self.assertTrue(os.path.isdir(new_day))
+
+    def test_missing_base_path_is_silent(self):
+        cfg = {"base_path": "/definitely/not/a/real/dir", "retention_days": 7}
+        with mock.patch.object(MONITOR, "_CFG", cfg), self.assertNoLogs(level="ERROR"):
+            MONITOR.cleanup_old_files()
+
+    def test_unlistable_subdir_does_not_abort_sweep(self):
+        with tempfile.TemporaryDirectory() as base:
+            clips = []
+            for day in ("01", "02"):
+                day_dir = os.path.join(base, day)
+                os.makedirs(day_dir)
+                clip = os.path.join(day_dir, "old.mp4")
+                with open(clip, "w") as f:
+                    f.write("x")
+                _touch(clip, 10)
+                clips.append(clip)
+
+            # Whichever day directory is listed first turns out to be unreadable.
+            real_scandir = os.scandir
+            locked = []
+
+            def scandir(path):
+                if path != base and (not locked or locked[0] == path):
+                    locked[:] = [path]
+                    raise PermissionError(13, "Permission denied", path)
+                return real_scandir(path)
+
+            cfg = {"base_path": base, "retention_days": 7}
+            with mock.patch.object(MONITOR, "_CFG", cfg), mock.patch.object(
+                MONITOR.os, "scandir", side_effect=scandir
+            ):
+                MONITOR.cleanup_old_files()
+
+            remaining = [clip for clip in clips if os.path.exists(clip)]
+            self.assertEqual(remaining, [os.path.join(locked[0], "old.mp4")])
+
+    def test_symlinked_directories_are_left_alone(self):
+        with tempfile.TemporaryDirectory() as base, tempfile.TemporaryDirectory() as outside:
+            target = os.path.join(outside, "archive")
+            os.makedirs(target)
+            kept = os.path.join(target, "old.mp4")
+            with open(kept, "w") as f:
+                f.write("x")
+            _touch(kept, 10)
+            link = os.path.join(base, "archive")
+            os.symlink(target, link)
+            os.utime(link, (0, 0), follow_symlinks=False)
+
+            cfg = {"base_path": base, "retention_days": 7}
+            with mock.patch.object(MONITOR, "_CFG", cfg):
+                MONITOR.cleanup_old_files()
+
+            self.assertTrue(os.path.islink(link))
+            self.assertTrue(os.path.exists(kept))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,28 +1,53 @@
+import configparser
+import inspect
 import os
 import tempfile
-import textwrap
 import unittest
-import importlib.util
-from pathlib import Path
+from unittest import mock
 
+import monitor.monitor as MONITOR
 
-def _load_monitor_module():
-    repo_root = Path(__file__).resolve().parents[2]
-    monitor_py = repo_root / "monitor" / "monitor.py"
-    spec = importlib.util.spec_from_file_location("reolink_monitor", monitor_py)
-    assert spec and spec.loader
-    mod = importlib.util.module_from_spec(spec)
-    spec.loader.exec_module(mod)
-    return mod
 
+EXPECTED_DEFAULTS = {
+    "base_path": "/home/camerauser/driveway",
+    "host_staging_path": "/var/lib/fakecam",
+    "container_staging_path": "/fakecam",
+    "error_video_name": "ERROR_ALERT.mp4",
+    "required_containers": ["obs_compositor", "mediamtx"],
+    "retention_days": 7,
+    "cooldown_seconds": 10,
+    "debounce_seconds": 2,
+    "debounce_max_seconds": 10,
+    "log_file": "/var/log/reolink_monitor.log",
+    "send_to": "root",
 
-class TestIniConfig(unittest.TestCase):
-    @classmethod
-    def setUpClass(cls):
-        cls.monitor = _load_monitor_module()
+    "obs_host": "127.0.0.1",
+    "obs_port": 4455,
+    "obs_password": "",
+    "obs_media_input": "Alert_Video",
+    "obs_scene_alert": "Alert",
+    "obs_scene_standby": "Standby",
 
-    def test_load_config_defaults(self):
-        ini = """\
+    "health_check_seconds": 300,
+    "main_loop_sleep_seconds": 10,
+    "directory_poll_seconds": 30,
+
+    "permissions_enabled": True,
+    "permissions_user_group": "",
+    "permissions_file_mode": 0o644,
+    "permissions_dir_mode": 0o755,
+}
+
+
+def _load_config_from_str(ini: str) -> dict:
+    config = configparser.ConfigParser()
+    config.read_string(ini)
+    return MONITOR._load_config_from_sections(config)
+
+
+class TestIniConfig(unittest.TestCase):
+    DEFAULTS_INI = inspect.cleandoc(
+        """
         [monitor]
         # intentionally empty: defaults should apply
 
@@ -35,107 +60,116 @@ class TestIniConfig(unittest.TestCase):
         [permissions]
         # intentionally empty
         """
-        with tempfile.NamedTemporaryFile("w", delete=False) as f:
-            f.write(textwrap.dedent(ini))
-            path = f.name
-
-        try:
-            cfg = self.monitor.load_config(path)
-            self.assertEqual(cfg["base_path"], "/home/camerauser/driveway")
-            self.assertEqual(cfg["container_staging_path"], "/fakecam")
-            self.assertEqual(cfg["error_video_name"], "ERROR_ALERT.mp4")
-            self.assertEqual(cfg["required_containers"], ["obs_compositor", "mediamtx"])
-            self.assertEqual(cfg["retention_days"], 7)
-            self.assertEqual(cfg["cooldown_seconds"], 10)
-            self.assertEqual(cfg["log_file"], "/var/log/reolink_monitor.log")
-            self.assertEqual(cfg["send_to"], "root")
-
-            self.assertEqual(cfg["obs_host"], "127.0.0.1")
-            self.assertEqual(cfg["obs_port"], 4455)
-            self.assertEqual(cfg["obs_media_input"], "Alert_Video")
-            self.assertEqual(cfg["obs_scene_alert"], "Alert")
-            self.assertEqual(cfg["obs_scene_standby"], "Standby")
-
-            self.assertEqual(cfg["health_check_seconds"], 300)
-            self.assertEqual(cfg["main_loop_sleep_seconds"], 10)
-            self.assertEqual(cfg["directory_poll_seconds"], 30)
-
-            self.assertTrue(cfg["permissions_enabled"])
-            self.assertEqual(cfg["permissions_user_group"], "")
-            self.assertEqual(cfg["permissions_file_mode"], 0o644)
-            self.assertEqual(cfg["permissions_dir_mode"], 0o755)
-        finally:
-            os.unlink(path)
+    )
 
-    def test_permissions_parsing(self):
-        ini = """\
+    PERMS_INI = inspect.cleandoc(
+        """
         [permissions]
         enabled = off
         user_group = 1000:1001
         file_mask = 600
         directory_mask = 0750
         """
-        with tempfile.NamedTemporaryFile("w", delete=False) as f:
-            f.write(textwrap.dedent(ini))
-            path = f.name
-
-        try:
-            cfg = self.monitor.load_config(path)
-            self.assertFalse(cfg["permissions_enabled"])
-            self.assertEqual(cfg["permissions_user_group"], "1000:1001")
-            self.assertEqual(cfg["permissions_file_mode"], 0o600)
-            self.assertEqual(cfg["permissions_dir_mode"], 0o750)
-        finally:
-            os.unlink(path)
+    )
+
+    _BASE_CFG = {
+        "base_path": "",
+        "host_staging_path": "",
+        "error_video_name": "ERROR_ALERT.mp4",
+        "required_containers": ["obs_compositor", "mediamtx"],
+        "obs_port": 4455,
+        "retention_days": 7,
+        "cooldown_seconds": 10,
+        "debounce_seconds": 2,
+        "debounce_max_seconds": 10,
+        "health_check_seconds": 300,
+        "main_loop_sleep_seconds": 10,
+        "directory_poll_seconds": 30,
+        "permissions_enabled": True,
+        "permissions_user_group": "",
+        "permissions_file_mode": 0o644,
+        "permissions_dir_mode": 0o755,
+    }
+
+    @classmethod
+    def setUpClass(cls):
+        # Prefer tmpfs so the shared fixture never touches disk.
+        shm = "/dev/shm" if os.path.isdir("/dev/shm") else None
+        cls._tmp = tempfile.TemporaryDirectory(dir=shm)
+        cls.tmp_path = cls._tmp.name
+
+    @classmethod
+    def tearDownClass(cls):
+        cls._tmp.cleanup()
+
+    def test_load_config_defaults(self):
+        cfg = _load_config_from_str(self.DEFAULTS_INI)
+        self.assertEqual({k: cfg[k] for k in EXPECTED_DEFAULTS}, EXPECTED_DEFAULTS)
+
+    def test_permissions_parsing(self):
+        eq = self.assertEqual
+        cfg = _load_config_from_str(self.PERMS_INI)
+        self.assertFalse(cfg["permissions_enabled"])
+        eq(cfg["permissions_user_group"], "1000:1001")
+        eq((cfg["_uid"], cfg["_gid"]), (1000, 1001))
+        eq(cfg["permissions_file_mode"], 0o600)
+        eq(cfg["permissions_dir_mode"], 0o750)
+
+    def test_load_config_rereads_modified_file(self):
+        # Lives in the class temp dir, which tearDownClass removes.
+        path = os.path.join(self.tmp_path, "reload.ini")
+        before = b"[monitor]\ncooldown_seconds = 5\n"
+        after = b"[monitor]\ncooldown_seconds = 20\n"
+        with open(path, "wb") as f:
+            f.write(before)
+
+        cfg = MONITOR.load_config(path)
+        self.assertEqual(cfg["cooldown_seconds"], 5)
+
+        with open(path, "wb") as f:
+            f.write(after)
+        st = os.stat(path)
+        os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+
+        cfg = MONITOR.load_config(path)
+        self.assertEqual(cfg["cooldown_seconds"], 20)
 
     def test_octal_mode_accepts_common_forms(self):
-        parse = self.monitor._parse_octal_mode
-        self.assertEqual(parse("644", 0), 0o644)
-        self.assertEqual(parse("0644", 0), 0o644)
-        self.assertEqual(parse("0o644", 0), 0o644)
-        self.assertEqual(parse("", 0o777), 0o777)
-        self.assertEqual(parse(None, 0o777), 0o777)
+        parse = MONITOR._parse_octal_mode
+        cases = (
+            ("644", 0, 0o644),
+            ("0644", 0, 0o644),
+            ("0o644", 0, 0o644),
+            ("", 0o777, 0o777),
+            (None, 0o777, 0o777),
+        )
+        for value, default, expected in cases:
+            with self.subTest(value=value):
+                self.assertEqual(parse(value, default), expected)
 
     def test_validate_config_detects_missing_base_path(self):
-        cfg = {
-            "base_path": "/definitely/not/a/real/dir",
-            "host_staging_path": "",
-            "error_video_name": "ERROR_ALERT.mp4",
-            "required_containers": ["obs_compositor"],
-            "obs_port": 4455,
-            "retention_days": 7,
-            "cooldown_seconds": 10,
-            "health_check_seconds": 300,
-            "main_loop_sleep_seconds": 10,
-            "directory_poll_seconds": 30,
-            "permissions_enabled": False,
-            "permissions_user_group": "",
-            "permissions_file_mode": 0o644,
-            "permissions_dir_mode": 0o755,
-        }
-        errors, warnings = self.monitor.validate_config(cfg)
+        cfg = self._BASE_CFG.copy()
+        cfg["base_path"] = "/definitely/not/a/real/dir"
+        cfg["required_containers"] = ["obs_compositor"]
+        cfg["permissions_enabled"] = False
+        errors, warnings = MONITOR.validate_config(cfg)
         self.assertTrue(any("base_path" in w for w in warnings))
 
     def test_validate_config_accepts_minimal_valid(self):
-        with tempfile.TemporaryDirectory() as tmp:
-            cfg = {
-                "base_path": tmp,
-                "host_staging_path": tmp,
-                "error_video_name": "ERROR_ALERT.mp4",
-                "required_containers": ["obs_compositor", "mediamtx"],
-                "obs_port": 4455,
-                "retention_days": 7,
-                "cooldown_seconds": 10,
-                "health_check_seconds": 300,
-                "main_loop_sleep_seconds": 10,
-                "directory_poll_seconds": 30,
-                "permissions_enabled": True,
-                "permissions_user_group": "",
-                "permissions_file_mode": 0o644,
-                "permissions_dir_mode": 0o755,
-            }
-            errors, warnings = self.monitor.validate_config(cfg)
-            self.assertEqual(errors, [])
+        cfg = self._BASE_CFG.copy()
+        cfg["base_path"] = "/fake"
+        cfg["host_staging_path"] = "/fake"
+        with mock.patch.object(MONITOR.os.path, "isdir", return_value=True):
+            errors, warnings = MONITOR.validate_config(cfg)
+        self.assertEqual(errors, [])
+
+    def test_validate_config_accepts_real_directories(self):
+        cfg = self._BASE_CFG.copy()
+        cfg["base_path"] = self.tmp_path
+        cfg["host_staging_path"] = self.tmp_path
+        errors, warnings = MONITOR.validate_config(cfg)
+        self.assertEqual(errors, [])
+        self.assertFalse(any("does not exist" in w for w in warnings))
 
 
 if __name__ == "__main__":
@@ -0,0 +1,312 @@
+import os
+import tempfile
+import threading
+import time
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+
+import monitor.monitor as MONITOR
+
+
+def _closed(path: str, is_directory: bool = False, event_type: str = "closed"):
+    return SimpleNamespace(src_path=path, is_directory=is_directory, event_type=event_type)
+
+
+class TestReolinkHandlerDebounce(unittest.TestCase):
+    def _make_handler(self, **overrides):
+        cfg = {
+            "cooldown_seconds": 0,
+            "debounce_seconds": 0.05,
+            "debounce_max_seconds": 1,
+            "permissions_enabled": False,
+        }
+        cfg.update(overrides)
+        handler = MONITOR.ReolinkHandler(cfg)
+        handler.triggered = []
+        handler.done = threading.Event()
+
+        def fake_trigger(path):
+            handler.triggered.append(path)
+            handler.done.set()
+
+        handler.trigger_obs = fake_trigger
+        return handler
+
+    def test_burst_triggers_once_with_newest_clip(self):
+        handler = self._make_handler()
+        for name in ("a.mp4", "b.mp4", "c.mp4"):
+            handler.dispatch(_closed(f"/clips/{name}"))
+
+        self.assertTrue(handler.done.wait(timeout=2))
+        self.assertEqual(handler.triggered, ["/clips/c.mp4"])
+
+    def test_continuous_burst_is_capped_by_debounce_max(self):
+        handler = self._make_handler(debounce_seconds=0.2, debounce_max_seconds=0.3)
+        start = time.monotonic()
+        # Uploads keep arriving faster than the debounce for well past the cap.
+        while time.monotonic() - start < 1.0 and not handler.done.is_set():
+            handler.dispatch(_closed("/clips/%f.mp4" % time.monotonic()))
+            time.sleep(0.05)
+
+        self.assertTrue(handler.done.is_set())
+        self.assertLess(time.monotonic() - start, 0.8)
+        self.assertEqual(len(handler.triggered), 1)
+
+    def test_cooldown_defers_instead_of_dropping(self):
+        handler = self._make_handler(cooldown_seconds=0.3)
+        handler.dispatch(_closed("/clips/a.mp4"))
+        self.assertTrue(handler.done.wait(timeout=2))
+        handler.done.clear()
+
+        start = time.monotonic()
+        handler.dispatch(_closed("/clips/b.mp4"))
+        self.assertTrue(handler.done.wait(timeout=2))
+        self.assertEqual(handler.triggered, ["/clips/a.mp4", "/clips/b.mp4"])
+        self.assertGreater(time.monotonic() - start, 0.15)
+
+    def test_clips_during_playback_collapse_to_newest(self):
+        handler = self._make_handler()
+        playing = threading.Event()
+        real_trigger = handler.trigger_obs
+
+        def slow_trigger(path):
+            playing.set()
+            time.sleep(0.5)
+            real_trigger(path)
+
+        handler.trigger_obs = slow_trigger
+        handler.dispatch(_closed("/clips/first.mp4"))
+        self.assertTrue(playing.wait(timeout=2))
+
+        # Several separate bursts land while the first clip is still playing.
+        for i in range(6):
+            handler.dispatch(_closed(f"/clips/late{i}.mp4"))
+            time.sleep(0.06)
+
+        deadline = time.monotonic() + 3
+        while len(handler.triggered) < 2 and time.monotonic() < deadline:
+            time.sleep(0.05)
+        time.sleep(0.6)
+        self.assertEqual(handler.triggered, ["/clips/first.mp4", "/clips/late5.mp4"])
+
+    def test_accepts_bytes_paths(self):
+        handler = self._make_handler()
+        handler.dispatch(_closed(b"/clips/a.mp4"))
+
+        self.assertTrue(handler.done.wait(timeout=2))
+        self.assertEqual(handler.triggered, ["/clips/a.mp4"])
+
+    def test_ignores_directories_and_non_mp4(self):
+        handler = self._make_handler()
+        handler.dispatch(_closed("/clips/notes.txt"))
+        handler.dispatch(_closed("/clips/dir.mp4", is_directory=True))
+        handler.dispatch(_closed("/clips/partial.mp4", event_type="modified"))
+
+        self.assertFalse(handler.done.wait(timeout=0.2))
+        self.assertEqual(handler.triggered, [])
+
+
+class TestReolinkHandlerObs(unittest.TestCase):
+    CFG = {
+        "cooldown_seconds": 0,
+        "debounce_seconds": 0,
+        "debounce_max_seconds": 0,
+        "permissions_enabled": False,
+        "container_staging_path": "/fakecam",
+        "error_video_name": "ERROR_ALERT.mp4",
+        "obs_host": "127.0.0.1",
+        "obs_port": 4455,
+        "obs_password": "",
+        "obs_media_input": "Alert_Video",
+        "obs_scene_alert": "Alert",
+        "obs_scene_standby": "Standby",
+        "send_to": "root",
+    }
+
+    def setUp(self):
+        patcher = mock.patch.object(MONITOR, "obs")
+        self.obs = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.obs.EventClient.return_value.worker.is_alive.return_value = True
+        self.handler = MONITOR.ReolinkHandler(dict(self.CFG))
+
+    def _scenes(self):
+        cl = self.obs.ReqClient.return_value
+        return [c.args[0] for c in cl.set_current_program_scene.call_args_list]
+
+    def test_playback_ended_event_wakes_trigger(self):
+        alert_shown = threading.Event()
+        cl = self.obs.ReqClient.return_value
+        cl.set_current_program_scene.side_effect = lambda scene: (
+            alert_shown.set() if scene == "Alert" else None
+        )
+        worker = threading.Thread(target=self.handler.trigger_obs, args=("/clips/a.mp4",))
+        start = time.monotonic()
+        worker.start()
+        self.assertTrue(alert_shown.wait(timeout=2))
+
+        # Only the configured media input counts.
+        self.handler.on_media_input_playback_ended(SimpleNamespace(input_name="Other"))
+        self.assertFalse(self.handler._playback_done.is_set())
+        self.assertTrue(worker.is_alive())
+
+        self.handler.on_media_input_playback_ended(
+            SimpleNamespace(input_name="Alert_Video")
+        )
+        worker.join(timeout=5)
+        self.assertFalse(worker.is_alive())
+        self.assertLess(time.monotonic() - start, 5)
+        self.assertEqual(self._scenes(), ["Alert", "Standby"])
+        callback = self.obs.EventClient.return_value.callback
+        callback.register.assert_called_once_with(self.handler.on_media_input_playback_ended)
+
+    def test_playback_timeout_still_rearms(self):
+        done = mock.Mock()
+        done.wait.return_value = False
+        with mock.patch.object(
+            MONITOR.threading, "Event", return_value=done
+        ), mock.patch.object(MONITOR.time, "sleep"), self.assertLogs(level="WARNING") as logs:
+            self.handler.trigger_obs("/clips/a.mp4")
+
+        done.wait.assert_called_once_with(timeout=60)
+        self.assertTrue(any("Timed out" in line for line in logs.output))
+        self.assertEqual(self._scenes(), ["Alert", "Standby"])
+        cl = self.obs.ReqClient.return_value
+        cl.set_input_settings.assert_called_with(
+            "Alert_Video", {"local_file": "/fakecam/ERROR_ALERT.mp4"}, overlay=True
+        )
+
+    def test_error_drops_clients_and_next_trigger_reconnects(self):
+        first_cl, second_cl = mock.Mock(), mock.Mock()
+        first_ev = self.obs.EventClient.return_value
+        first_cl.set_input_settings.side_effect = ConnectionError("obs went away")
+        self.obs.ReqClient.side_effect = [first_cl, second_cl]
+
+        done = mock.Mock()
+        done.wait.return_value = True
+        with mock.patch.object(MONITOR, "send_alert_email") as alert, mock.patch.object(
+            MONITOR.threading, "Event", return_value=done
+        ), mock.patch.object(MONITOR.time, "sleep"), self.assertLogs(level="ERROR"):
+            self.handler.trigger_obs("/clips/a.mp4")
+
+            alert.assert_called_once()
+            first_cl.disconnect.assert_called_once()
+            first_ev.disconnect.assert_called_once()
+            self.assertIsNone(self.handler.cl)
+            self.assertIsNone(self.handler.ev)
+
+            self.handler.trigger_obs("/clips/b.mp4")
+
+        self.assertEqual(self.obs.ReqClient.call_count, 2)
+        self.assertEqual(self.obs.EventClient.call_count, 2)
+        self.assertIs(self.handler.cl, second_cl)
+        second_cl.set_current_program_scene.assert_any_call("Alert")
+        alert.assert_called_once()
+
+    def test_stale_clients_are_replaced(self):
+        stale_cl, fresh_cl = mock.Mock(), mock.Mock()
+        stale_cl.get_version.side_effect = OSError("socket closed")
+        self.obs.ReqClient.side_effect = [stale_cl, fresh_cl]
+        self.assertIs(self.handler._get_client(), stale_cl)
+        self.assertIs(self.handler._get_client(), fresh_cl)
+        stale_cl.disconnect.assert_called_once()
+
+        dead_ev, live_ev = mock.Mock(), mock.Mock()
+        dead_ev.worker.is_alive.return_value = False
+        self.obs.EventClient.side_effect = [dead_ev, live_ev]
+        self.assertIs(self.handler._get_event_client(), dead_ev)
+        self.assertIs(self.handler._get_event_client(), live_ev)
+        dead_ev.disconnect.assert_called_once()
+        live_ev.callback.register.assert_called_once_with(
+            self.handler.on_media_input_playback_ended
+        )
+
+
+class TestWaitForDirectory(unittest.TestCase):
+    def test_wakes_on_creation_without_waiting_for_poll(self):
+        with tempfile.TemporaryDirectory() as base:
+            target = os.path.join(base, "2020", "01", "02")
+            os.makedirs(os.path.dirname(os.path.dirname(target)))
+
+            result = {}
+            waiter = threading.Thread(
+                target=lambda: result.setdefault(
+                    "ok", MONITOR.wait_for_directory(target, base, 30)
+                )
+            )
+            with mock.patch.object(MONITOR, "get_current_date_path", return_value=target):
+                start = time.monotonic()
+                waiter.start()
+                time.sleep(0.2)
+                os.makedirs(target)
+                waiter.join(timeout=5)
+
+            self.assertTrue(result.get("ok"))
+            self.assertLess(time.monotonic() - start, 5)
+
+    def test_borrowed_observer_keeps_running(self):
+        with tempfile.TemporaryDirectory() as base:
+            target = os.path.join(base, "2020", "01", "02")
+            os.makedirs(os.path.dirname(target))
+            observer = MONITOR.Observer()
+            observer.start()
+            try:
+                with mock.patch.object(
+                    MONITOR, "get_current_date_path", return_value=target
+                ):
+                    threading.Timer(0.2, os.makedirs, args=(target,)).start()
+                    self.assertTrue(
+                        MONITOR.wait_for_directory(target, base, 30, observer)
+                    )
+                self.assertTrue(observer.is_alive())
+                self.assertEqual(observer.emitters, set())
+            finally:
+                observer.stop()
+                observer.join()
+
+    def test_returns_false_on_day_rollover(self):
+        with tempfile.TemporaryDirectory() as base:
+            target = os.path.join(base, "2020", "01", "02")
+            with mock.patch.object(
+                MONITOR, "get_current_date_path", return_value=target + "-next"
+            ):
+                self.assertFalse(MONITOR.wait_for_directory(target, base, 0.01))
+
+
+class TestEnsureObserver(unittest.TestCase):
+    def test_live_observer_is_kept(self):
+        observer = MONITOR.Observer()
+        observer.start()
+        try:
+            self.assertIs(MONITOR._ensure_observer(observer), observer)
+        finally:
+            observer.stop()
+            observer.join()
+
+    def test_observer_killed_by_handler_is_replaced(self):
+        class Boom(MONITOR.FileSystemEventHandler):
+            def dispatch(self, event):
+                raise RuntimeError("boom")
+
+        with tempfile.TemporaryDirectory() as base:
+            observer = MONITOR.Observer()
+            observer.start()
+            observer.schedule(Boom(), base)
+            with mock.patch.object(threading, "excepthook"):
+                open(os.path.join(base, "a.mp4"), "w").close()
+                observer.join(timeout=5)
+            self.assertFalse(observer.is_alive())
+
+            with self.assertLogs(level="ERROR"):
+                replacement = MONITOR._ensure_observer(observer)
+            try:
+                self.assertIsNot(replacement, observer)
+                self.assertTrue(replacement.is_alive())
+            finally:
+                replacement.stop()
+                replacement.join()
+
+
+if __name__ == "__main__":
+    unittest.main()